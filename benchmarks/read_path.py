@@ -0,0 +1,271 @@
+"""Compare read-path performance of sqlalchemy and the sa2django-generated models.
+
+Both paths run equivalent workloads against the same generated sqlite database, which
+uses the schema in ``tests/sa_models.py``. For each workload and path the latency
+percentiles and the peak traced memory per operation are reported. The peak is
+the maximum of memory allocated and still alive during the operation, not the total
+number or size of all allocations.
+
+Usage::
+
+    python -m benchmarks.read_path --scale 1000 --save bench.json
+    python -m benchmarks.read_path --scale 1000 --baseline bench.json
+
+With ``--baseline``, operations whose median latency regressed by more than
+``--threshold`` compared to the baseline are flagged and the exit code is 1.
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.testsite.testsite.settings")
+django.setup()
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import tests.testsite.testapp.models as dm  # noqa: E402
+from tests import sa_models as sm  # noqa: E402
+
+CHILDREN_PER_PARENT = 5
+CARS_PER_PARENT = 2
+
+
+class Result(NamedTuple):
+    workload: str
+    path: str
+    n: int
+    p50: float
+    p95: float
+    p99: float
+    peak_kib_per_op: float
+
+
+def create_database(scale: int, seed: int = 0):
+    """Create the schema and fill it with ``scale`` parents and their relatives.
+
+    Returns the sqlalchemy engine, which must be kept alive for the lifetime of the
+    in-memory database.
+    """
+    engine = create_engine(
+        "sqlite://",
+        creator=lambda: sqlite3.connect(
+            "file:memorydb?mode=memory&cache=shared", uri=True
+        ),
+    )
+    sm.Base.metadata.drop_all(engine)
+    sm.Base.metadata.create_all(engine)
+
+    rng = random.Random(seed)
+    n_cars = scale * CARS_PER_PARENT
+    parents = [{"id": i, "name": f"parent {i}"} for i in range(1, scale + 1)]
+    children = [
+        {
+            "key": i,
+            "name": f"child {i}",
+            "age": rng.randint(0, 18),
+            "boolfield": bool(i % 2),
+            "parent_id": (i - 1) // CHILDREN_PER_PARENT + 1,
+        }
+        for i in range(1, scale * CHILDREN_PER_PARENT + 1)
+    ]
+    cars = [
+        {"car_id": i, "horsepower": rng.randint(40, 600)} for i in range(1, n_cars + 1)
+    ]
+    assocs = [
+        {"id": i, "parent_id": (i - 1) // CARS_PER_PARENT + 1, "id_car": i}
+        for i in range(1, n_cars + 1)
+    ]
+    with engine.begin() as conn:
+        conn.execute(sm.Parent.__table__.insert(), parents)
+        conn.execute(sm.Child.__table__.insert(), children)
+        conn.execute(sm.Car.__table__.insert(), cars)
+        conn.execute(sm.CarParentAssoc.__table__.insert(), assocs)
+    return engine
+
+
+def make_workloads(
+    session, scale: int, seed: int = 0
+) -> Dict[str, Dict[str, Callable]]:
+    """ Return {workload: {path: operation}} where each operation takes one key """
+    n_children = scale * CHILDREN_PER_PARENT
+    n_cars = scale * CARS_PER_PARENT
+
+    def sa_pk_lookup(rng):
+        return session.query(sm.Parent).filter(sm.Parent.id == rng(scale)).one().name
+
+    def dj_pk_lookup(rng):
+        return dm.Parent.objects.get(pk=rng(scale)).name
+
+    def sa_fk(rng):
+        child = session.query(sm.Child).filter(sm.Child.key == rng(n_children)).one()
+        return child.parent.name
+
+    def dj_fk(rng):
+        return dm.Child.objects.get(pk=rng(n_children)).parent.name
+
+    def sa_m2m_cars(rng):
+        parent = session.query(sm.Parent).filter(sm.Parent.id == rng(scale)).one()
+        return [car.horsepower for car in parent.cars]
+
+    def dj_m2m_cars(rng):
+        parent = dm.Parent.objects.get(pk=rng(scale))
+        return [car.horsepower for car in parent.cars.all()]
+
+    def sa_m2m_drivers(rng):
+        car = session.query(sm.Car).filter(sm.Car.car_id == rng(n_cars)).one()
+        return [parent.name for parent in car.drivers]
+
+    def dj_m2m_drivers(rng):
+        car = dm.Car.objects.get(pk=rng(n_cars))
+        return [parent.name for parent in car.drivers.all()]
+
+    def sa_scan(rng):
+        return sum(c.age for c in session.query(sm.Child).yield_per(1000))
+
+    def dj_scan(rng):
+        return sum(c.age for c in dm.Child.objects.iterator(chunk_size=1000))
+
+    return {
+        "pk lookup": {"sqlalchemy": sa_pk_lookup, "django": dj_pk_lookup},
+        "fk traversal": {"sqlalchemy": sa_fk, "django": dj_fk},
+        "m2m Parent.cars": {"sqlalchemy": sa_m2m_cars, "django": dj_m2m_cars},
+        "m2m Car.drivers": {"sqlalchemy": sa_m2m_drivers, "django": dj_m2m_drivers},
+        "full scan": {"sqlalchemy": sa_scan, "django": dj_scan},
+    }
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(
+    name: str, path: str, op: Callable, n: int, session, seed: int = 0
+) -> Result:
+    """Run ``op`` n times and measure latency and peak traced memory.
+
+    Latency and memory are measured in separate passes because tracing allocations
+    slows down the interpreter considerably.
+    """
+    rng = random.Random(seed)
+
+    def key(upper):
+        return rng.randint(1, upper)
+
+    op(key)  # warm up caches and connections
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        op(key)
+        timings.append(time.perf_counter() - start)
+        session.expunge_all()
+
+    n_mem = max(1, n // 10)
+    peaks = []
+    for _ in range(n_mem):
+        tracemalloc.start()
+        op(key)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+        session.expunge_all()
+
+    timings.sort()
+    return Result(
+        workload=name,
+        path=path,
+        n=n,
+        p50=percentile(timings, 0.5) * 1e6,
+        p95=percentile(timings, 0.95) * 1e6,
+        p99=percentile(timings, 0.99) * 1e6,
+        peak_kib_per_op=statistics.mean(peaks) / 1024,
+    )
+
+
+def print_results(results: List[Result], file=sys.stdout) -> None:
+    header = (
+        f"{'workload':<18}{'path':<12}{'n':>6}"
+        f"{'p50 us':>12}{'p95 us':>12}{'p99 us':>12}{'peak KiB/op':>13}{'dj/sa':>8}"
+    )
+    print(header, file=file)
+    print("-" * len(header), file=file)
+    sa_p50 = {r.workload: r.p50 for r in results if r.path == "sqlalchemy"}
+    for r in results:
+        ratio = r.p50 / sa_p50[r.workload] if r.path == "django" else 1.0
+        print(
+            f"{r.workload:<18}{r.path:<12}{r.n:>6}"
+            f"{r.p50:>12.1f}{r.p95:>12.1f}{r.p99:>12.1f}{r.peak_kib_per_op:>13.1f}"
+            f"{ratio:>8.2f}",
+            file=file,
+        )
+
+
+def find_regressions(
+    results: List[Result], baseline: List[dict], threshold: float
+) -> List[str]:
+    previous = {(b["workload"], b["path"]): b for b in baseline}
+    regressions = []
+    for r in results:
+        b = previous.get((r.workload, r.path))
+        if b is not None and r.p50 > b["p50"] * (1 + threshold):
+            regressions.append(
+                f"{r.workload} ({r.path}): p50 {b['p50']:.1f}us -> {r.p50:.1f}us"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", type=int, default=1000, help="number of parents")
+    parser.add_argument("-n", type=int, default=500, help="operations per workload")
+    parser.add_argument(
+        "--scan-n", type=int, default=10, help="operations for the full scan workload"
+    )
+    parser.add_argument("--save", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare to results saved with --save")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative p50 slowdown that counts as regression",
+    )
+    args = parser.parse_args(argv)
+
+    engine = create_database(args.scale)
+    session = sessionmaker(bind=engine)()
+    results = []
+    for name, paths in make_workloads(session, args.scale).items():
+        n = args.scan_n if name == "full scan" else args.n
+        for path, op in paths.items():
+            results.append(measure(name, path, op, n, session))
+    session.close()
+
+    print_results(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump([r._asdict() for r in results], f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
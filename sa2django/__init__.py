@@ -1 +1,2 @@
 from .core import SA2DModel, register_table
+from .registry import SA2DRegistry
@@ -0,0 +1,140 @@
+import logging
+from typing import Any, Dict, Iterable, Optional, Type
+
+import sqlalchemy as sa
+from django.contrib import admin
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from sqlalchemy.util import symbol
+
+from sa2django.core import get_sa_model
+
+logger = logging.getLogger(__name__)
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator that uses the planner statistics of the database as count.
+
+    A full ``COUNT(*)`` is expensive on large tables. For unfiltered querysets this
+    paginator reads the estimated number of rows from ``pg_class.reltuples`` on
+    PostgreSQL and from ``sqlite_stat1`` on sqlite (available after ``ANALYZE``).
+    If no estimate is available, the queryset is filtered, or the estimate is below
+    ``approximate_threshold``, the exact count is used.
+    """
+
+    approximate_threshold = 10000
+    """ Tables with fewer estimated rows are counted exactly. """
+
+    @cached_property
+    def count(self):
+        estimate = self.estimate_count()
+        if estimate is not None and estimate >= self.approximate_threshold:
+            return estimate
+        return super().count
+
+    def estimate_count(self) -> Optional[int]:
+        qs = self.object_list
+        if not isinstance(qs, QuerySet):
+            return None
+        query = qs.query
+        if query.where or query.distinct or query.is_sliced:
+            return None
+        connection = connections[qs.db]
+        table = qs.model._meta.db_table
+        if connection.vendor == "postgresql":
+            sql = "SELECT reltuples FROM pg_class WHERE oid = %s::regclass"
+            table = connection.ops.quote_name(table)
+        elif connection.vendor == "sqlite":
+            # the row without index only exists for tables without any index, the
+            # first number of every row is the number of rows of the table
+            sql = (
+                "SELECT stat FROM sqlite_stat1 WHERE tbl = %s "
+                "ORDER BY idx IS NOT NULL LIMIT 1"
+            )
+        else:
+            return None
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [table])
+                row = cursor.fetchone()
+        except DatabaseError:
+            # no statistics table, e.g. sqlite database that has never been analyzed
+            logger.debug(f"No row estimate available for table {table}")
+            return None
+        if row is None:
+            return None
+        # sqlite_stat1 stores "<rows> <rows per index key> ..."
+        estimate = int(float(str(row[0]).split()[0]))
+        if estimate < 0:
+            # PostgreSQL reports -1 for tables that have never been analyzed
+            return None
+        return estimate
+
+
+def model_admin_attrs(django_model: type) -> Dict[str, Any]:
+    """Derive large-table-safe ``ModelAdmin`` options from the sqlalchemy mapper.
+
+    * foreign keys and many-to-many fields are edited with ``raw_id_fields``
+      instead of dropdowns that load the whole related table
+    * many-to-one relationships are added to ``list_select_related``
+    * the changelist uses ``ApproximateCountPaginator`` and does not show the full
+      result count
+    """
+    opts = django_model._meta
+    inspection = sa.inspect(get_sa_model(django_model))
+
+    many_to_one = [
+        relation.key
+        for relation in inspection.relationships
+        if relation.direction == symbol("MANYTOONE")
+    ]
+    fks = []
+    for name in many_to_one:
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            logger.debug(f"No django field for relationship {name}. Skipping")
+            continue
+        if field.many_to_one:
+            fks.append(name)
+    m2ms = [
+        f.name for f in opts.many_to_many if f.remote_field.through._meta.auto_created
+    ]
+
+    return dict(
+        list_display=tuple(f.name for f in opts.concrete_fields),
+        list_select_related=tuple(fks),
+        raw_id_fields=tuple(fks + m2ms),
+        paginator=ApproximateCountPaginator,
+        show_full_result_count=False,
+    )
+
+
+def make_model_admin(
+    django_model: type, base: Type[admin.ModelAdmin] = admin.ModelAdmin, **kwargs
+) -> Type[admin.ModelAdmin]:
+    """Generate a ``ModelAdmin`` class for a model generated by sa2django.
+
+    Parameters
+    ----------
+    django_model : type
+        django model generated by sa2django
+    base : type, optional
+        base class of the generated admin. The default is ``ModelAdmin``.
+    **kwargs
+        additional attributes of the admin class, which override the derived ones
+    """
+    attrs = model_admin_attrs(django_model)
+    attrs.update(kwargs)
+    return type(f"{django_model.__name__}Admin", (base,), attrs)
+
+
+def register_sa2d_admins(
+    models: Iterable[type], site: admin.AdminSite = admin.site
+) -> None:
+    """ Register a generated ``ModelAdmin`` for each of the given models """
+    for Model in models:
+        site.register(Model, make_model_admin(Model))
@@ -1,3 +1,6 @@
+import base64
+from typing import Any, Callable, Optional, Type
+
 import django.db.models as dm
 import sqlalchemy as sa
 from citext import CIText
@@ -18,6 +21,13 @@ class TypeMapper:
     def field_cls(cls, type: TypeEngine):
         raise NotImplementedError
 
+    @classmethod
+    def json_converter(cls, type: TypeEngine) -> Optional[Callable[[Any], Any]]:
+        """Return a function that converts a non-null value of this type to a JSON
+        compatible value, or None if the value can be serialized as is.
+        """
+        return None
+
 
 class IntMapper(TypeMapper):
     @classmethod
@@ -66,23 +76,43 @@ class BooleanMapper(TypeMapper):
         return dm.BooleanField
 
 
+def _binary_to_json(value) -> str:
+    return base64.b64encode(bytes(value)).decode("ascii")
+
+
+def _isoformat(value) -> str:
+    return value.isoformat()
+
+
 class BinaryMapper(TypeMapper):
     @classmethod
     def field_cls(cls, type: TypeEngine):
         return dm.BinaryField
 
+    @classmethod
+    def json_converter(cls, type: TypeEngine):
+        return _binary_to_json
+
 
 class DateMapper(TypeMapper):
     @classmethod
     def field_cls(cls, type: TypeEngine):
         return dm.DateField
 
+    @classmethod
+    def json_converter(cls, type: TypeEngine):
+        return _isoformat
+
 
 class DateTimeMapper(TypeMapper):
     @classmethod
     def field_cls(cls, type: TypeEngine):
         return dm.DateTimeField
 
+    @classmethod
+    def json_converter(cls, type: TypeEngine):
+        return _isoformat
+
 
 type_mappers = {
     sa.Integer: IntMapper,
@@ -115,8 +145,12 @@ def common_kwargs(sa_col: sa.Column):
     return kwargs
 
 
+def get_type_mapper(sa_col: sa.Column) -> Type[TypeMapper]:
+    return type_mappers[sa_col.type.__class__]
+
+
 def map_column(sa_col: sa.Column):
-    type_mapper = type_mappers[sa_col.type.__class__]
+    type_mapper = get_type_mapper(sa_col)
     cls = type_mapper.field_cls(sa_col.type)
     kwargs = {}
     kwargs.update(type_mapper.type_kwargs(sa_col.type))
@@ -1,6 +1,6 @@
 import inspect
 import logging
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Type
 
 import sqlalchemy as sa
 from django.db import models as dm
@@ -11,6 +11,13 @@ from sqlalchemy.util import symbol
 from sqlalchemy_utils import get_mapper
 
 from sa2django.column_mappers import map_column
+from sa2django.exceptions import SA2DjangoException
+from sa2django.query import SA2DManager
+from sa2django.registry import (  # noqa: F401 (get_sa_model is re-exported)
+    SA2DRegistry,
+    default_registry,
+    get_sa_model,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,40 +33,43 @@ def extract_tables_from_module(module):
     return tables
 
 
-class SA2DjangoException(Exception):
-    pass
-
-
 class SA2DBase(ModelBase):
-    table_mapping = {}
-    related_fields = set()
+    # the bookkeeping of the default registry, kept for backwards compatibility
+    table_mapping = default_registry.table_mapping
+    related_fields = default_registry.related_fields
 
     @classmethod
     def register_table(cls, tablename: str, dm_model_name: str):
-        cls.table_mapping[tablename] = dm_model_name
+        default_registry.register_table(tablename, dm_model_name)
 
     def __new__(cls, name, bases, attrs, **kwargs):
+        sa_model = None
+        registry = default_registry
         if "Meta" in attrs:
             meta = attrs["Meta"]
+            if hasattr(meta, "sa_registry"):
+                registry = meta.sa_registry
+                del meta.sa_registry
             if hasattr(meta, "sa_model"):
                 sa_model = meta.sa_model
-                cls.sa_model = sa_model
                 del meta.sa_model
 
                 if not hasattr(meta, "db_table"):
                     # set table name from sa model, unless explicitly specified
                     meta.db_table = sa_model.__tablename__
+                if registry.app_label is not None and not hasattr(meta, "app_label"):
+                    meta.app_label = registry.app_label
 
                 logger.debug(
                     f"\nGenerating Django model for table '{sa_model.__tablename__}'"
                 )
 
-                cls.register_table(meta.db_table, name)
+                registry.register_table(meta.db_table, name)
 
                 ins = sa.inspect(sa_model.__table__)
 
                 # make foreign keys
-                fks = cls.foreign_keys(sa_model)
+                fks = cls.foreign_keys(sa_model, registry)
                 fk_names = set()
                 for k, v in fks.items():
                     if k not in attrs:
@@ -67,16 +77,16 @@ class SA2DBase(ModelBase):
                         fk_names.add(v.db_column)
 
                 # make many to many fields
-                m2ms = cls.many_to_many_fields(sa_model)
+                m2ms = cls.many_to_many_fields(sa_model, registry)
                 m2m_names = set()
                 for field, v in m2ms.items():
                     class_name = f"{name}"
                     full_field = f"{class_name}.{field}"
-                    if field not in attrs and full_field not in cls.related_fields:
+                    if field not in attrs and full_field not in registry.related_fields:
                         attrs[field] = dm.ManyToManyField(**v)
                         m2m_names.add(field)
                         related_field = f"{v['to']}.{v['related_name']}"
-                        cls.related_fields.add(related_field)
+                        registry.related_fields.add(related_field)
 
                 # make columns
                 for col in ins.columns:
@@ -86,10 +96,16 @@ class SA2DBase(ModelBase):
                         attrs[col.name] = map_column(col)
 
                 # TODO keep track of created columns, and recreate if new sa_model is received
-        return super().__new__(cls, name, bases, attrs, **kwargs)
+        django_model = super().__new__(cls, name, bases, attrs, **kwargs)
+        if sa_model is not None:
+            django_model._sa_model = sa_model
+            registry.add_model(django_model)
+        return django_model
 
     @classmethod
-    def foreign_keys(mcs, sa_model) -> Dict[str, dm.ForeignKey]:
+    def foreign_keys(
+        mcs, sa_model, registry: SA2DRegistry = default_registry
+    ) -> Dict[str, dm.ForeignKey]:
         inspection = sa.inspect(sa_model)
         fks = {}
         table_name = sa_model.__tablename__
@@ -112,7 +128,7 @@ class SA2DBase(ModelBase):
             if remote_table == table_name:
                 to = "self"
             else:
-                to = mcs.table_mapping[remote_table]
+                to = registry.table_mapping[remote_table]
             fks[field_name] = dm.ForeignKey(
                 to,
                 on_delete=dm.CASCADE,
@@ -147,7 +163,7 @@ class SA2DBase(ModelBase):
         return relations
 
     @classmethod
-    def many_to_many_fields(mcs, sa_model):
+    def many_to_many_fields(mcs, sa_model, registry: SA2DRegistry = default_registry):
         inspection = sa.inspect(sa_model)
         table_name = sa_model.__tablename__
 
@@ -157,7 +173,7 @@ class SA2DBase(ModelBase):
                 continue
             name = relation.key
             sa_through_table = relation.secondary
-            dj_through_table = mcs.table_mapping[relation.secondary.name]
+            dj_through_table = registry.table_mapping[relation.secondary.name]
             through_mapper = get_mapper(sa_through_table)
             related_name = relation.back_populates
             if len(relation.remote_side) != 2:
@@ -175,7 +191,7 @@ class SA2DBase(ModelBase):
             if remote_table == table_name:
                 to = "self"
             else:
-                to = mcs.table_mapping[remote_table]
+                to = registry.table_mapping[remote_table]
             m2ms[name] = dict(
                 to=to,
                 through=dj_through_table,
@@ -200,19 +216,27 @@ class SA2DBase(ModelBase):
 
 
 class SA2DModel(dm.Model, metaclass=SA2DBase):
+    objects = SA2DManager()
+
     class Meta:
         abstract = True
         managed = False
 
 
-def register_table(tablename: str, dm_model_name: str):
-    SA2DBase.register_table(tablename, dm_model_name)
+def register_table(
+    tablename: str, dm_model_name: str, registry: Optional[SA2DRegistry] = None
+):
+    if registry is None:
+        registry = default_registry
+    registry.register_table(tablename, dm_model_name)
 
 
 # def find_foreign_key_field_name(foreign_key: Column):
 
 
-def generate_django_model(sa_model_class: type, modulename: str) -> type:
+def generate_django_model(
+    sa_model_class: type, modulename: str, registry: Optional[SA2DRegistry] = None
+) -> type:
     """Generate a single django model from a single sqlalchemy declarative mapper.
 
     Parameters
@@ -221,10 +245,15 @@ def generate_django_model(sa_model_class: type, modulename: str) -> type:
         sqlalchemy model class
     modulename : str
         the __module__ attribute of the django model is set to this value
+    registry : SA2DRegistry, optional
+        registry of the model. The default is the global default registry.
 
     """
     tablename = sa_model_class.__tablename__
-    meta = type("Meta", (object,), {"sa_model": sa_model_class, "db_table": tablename})
+    meta_attrs = {"sa_model": sa_model_class, "db_table": tablename}
+    if registry is not None:
+        meta_attrs["sa_registry"] = registry
+    meta = type("Meta", (object,), meta_attrs)
     django_model = type(
         sa_model_class.__name__,
         (SA2DModel,),
@@ -236,7 +265,9 @@ def generate_django_model(sa_model_class: type, modulename: str) -> type:
     return django_model
 
 
-def generate_sa2d_models(base, modulename: str) -> List[type]:
+def generate_sa2d_models(
+    base, modulename: str, registry: Optional[SA2DRegistry] = None
+) -> List[type]:
     """Generate django models from all declarative base models in a sqlalchemy base.
 
     Parameters
@@ -245,6 +276,10 @@ def generate_sa2d_models(base, modulename: str) -> List[type]:
         base from which to extract models
     modulename : str
         The __module__ attribute of the generated classes is set to this
+    registry : SA2DRegistry, optional
+        registry that keeps track of the generated models. Use a separate registry
+        per base to be able to unload the models with ``registry.unload()``.
+        The default is the global default registry.
 
     Returns
     -------
@@ -254,12 +289,12 @@ def generate_sa2d_models(base, modulename: str) -> List[type]:
     tables = extract_tables_from_base(base)
     # register all tables
     for tablename, sa_class in tables.items():
-        register_table(tablename, sa_class.__name__)
+        register_table(tablename, sa_class.__name__, registry)
 
     # generate all django models
     django_models = []
     for sa_class in tables.values():
-        django_model = generate_django_model(sa_class, modulename)
+        django_model = generate_django_model(sa_class, modulename, registry)
         django_models.append(django_model)
     return django_models
 
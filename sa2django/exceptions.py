@@ -0,0 +1,2 @@
+class SA2DjangoException(Exception):
+    pass
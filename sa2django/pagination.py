@@ -0,0 +1,249 @@
+import base64
+import binascii
+import datetime
+import json
+from typing import Any, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import sqlalchemy as sa
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models as dm
+from django.db.models import BooleanField, F, Func, Q, Value
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+from sa2django.exceptions import SA2DjangoException
+from sa2django.registry import get_sa_model
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetField(NamedTuple):
+    field: dm.Field
+    descending: bool
+
+
+class KeysetPage(NamedTuple):
+    items: list
+    next_cursor: Optional[str]
+
+
+def sa_ordering(sa_model) -> List[Tuple[str, bool]]:
+    """Return the columns by which a sqlalchemy model is ordered.
+
+    The ordering is read from the ``order_by`` mapper argument and completed with
+    the primary key such that it is unique.
+
+    Returns
+    -------
+    ordering : list[tuple[str, bool]]
+        list of (column name, descending)
+    """
+    mapper = sa.inspect(sa_model)
+    ordering = []
+    for clause in mapper.order_by or []:
+        descending = False
+        if isinstance(clause, UnaryExpression):
+            descending = clause.modifier is operators.desc_op
+            clause = clause.element
+        if not isinstance(clause, sa.Column):
+            raise SA2DjangoException(
+                f"ordering of {sa_model.__name__} by {clause} is not supported, "
+                "only columns are"
+            )
+        ordering.append((clause.name, descending))
+    names = {name for name, _ in ordering}
+    descending = ordering[-1][1] if ordering else False
+    for col in mapper.primary_key:
+        if col.name not in names:
+            ordering.append((col.name, descending))
+    return ordering
+
+
+def keyset_fields(django_model: type) -> List[KeysetField]:
+    """Return the django fields that make up the keyset of a model.
+
+    The keyset is cached on the model class, such that it is garbage collected
+    together with the model.
+    """
+    keyset = django_model.__dict__.get("_sa2d_keyset")
+    if keyset is not None:
+        return keyset
+    by_column = {f.column: f for f in django_model._meta.concrete_fields}
+    keyset = []
+    for name, descending in sa_ordering(get_sa_model(django_model)):
+        if name not in by_column:
+            raise SA2DjangoException(
+                f"{django_model.__name__} has no field for ordering column {name}"
+            )
+        if by_column[name].null:
+            raise SA2DjangoException(
+                f"{django_model.__name__} is ordered by nullable column {name}, "
+                "which is not supported by keyset pagination"
+            )
+        keyset.append(KeysetField(by_column[name], descending))
+    django_model._sa2d_keyset = keyset
+    return keyset
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """JSON encoder that keeps the full precision of datetimes and times.
+
+    ``DjangoJSONEncoder`` truncates them to milliseconds, which would make the next
+    page start before the last row of the previous one.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    data = json.dumps(list(values), cls=CursorJSONEncoder).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def decode_cursor(cursor: str, keyset: Sequence[KeysetField]) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursor(f"malformed cursor {cursor!r}")
+    if not isinstance(values, list) or len(values) != len(keyset):
+        raise InvalidCursor(f"cursor {cursor!r} does not match the ordering")
+    if any(v is None for v in values):
+        raise InvalidCursor(f"cursor {cursor!r} contains null values")
+    try:
+        return [k.field.to_python(v) for k, v in zip(keyset, values)]
+    except (ValidationError, TypeError):
+        raise InvalidCursor(f"cursor {cursor!r} contains invalid values")
+
+
+class RowValueCompare(Func):
+    """ Boolean expression ``(lhs1, lhs2, ...) <op> (rhs1, rhs2, ...)`` """
+
+    output_field = BooleanField()
+
+    def __init__(self, lhs: Sequence[Any], rhs: Sequence[Any], op: str):
+        if len(lhs) != len(rhs):
+            raise ValueError("row values must have the same length")
+        super().__init__(*lhs, *rhs)
+        self.op = op
+
+    def as_sql(self, compiler, connection):
+        sqls = []
+        params = []
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            sqls.append(sql)
+            params.extend(expression_params)
+        n = len(sqls) // 2
+        lhs = ", ".join(sqls[:n])
+        rhs = ", ".join(sqls[n:])
+        return f"({lhs}) {self.op} ({rhs})", params
+
+
+def _supports_row_values(connection) -> bool:
+    if connection.vendor == "postgresql":
+        return True
+    if connection.vendor == "sqlite":
+        return connection.Database.sqlite_version_info >= (3, 15, 0)
+    return False
+
+
+class KeysetQuerySet(dm.QuerySet):
+    """QuerySet with keyset (seek) pagination.
+
+    Pages are ordered by the sqlalchemy ``order_by`` mapper argument and the primary
+    key. Instead of an offset, each page continues after the last row of the previous
+    page, so the cost of fetching a page does not depend on its depth. The columns of
+    the ordering must not be nullable.
+    """
+
+    def keyset_order(self) -> "KeysetQuerySet":
+        return self.order_by(
+            *[
+                f"-{k.field.attname}" if k.descending else k.field.attname
+                for k in keyset_fields(self.model)
+            ]
+        )
+
+    def keyset_after(self, values: Sequence[Any]) -> "KeysetQuerySet":
+        """ Filter for rows that come after the given keyset values """
+        keyset = keyset_fields(self.model)
+        connection = connections[self.db]
+        directions = {k.descending for k in keyset}
+        if (
+            len(keyset) > 1
+            and len(directions) == 1
+            and _supports_row_values(connection)
+        ):
+            # a single row value comparison can use a multi-column index
+            op = "<" if directions.pop() else ">"
+            return self.filter(
+                RowValueCompare(
+                    [F(k.field.attname) for k in keyset],
+                    [Value(v, output_field=k.field) for k, v in zip(keyset, values)],
+                    op,
+                )
+            )
+
+        # (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...
+        condition = Q()
+        for i, k in enumerate(keyset):
+            lookup = "lt" if k.descending else "gt"
+            term = Q(**{f"{k.field.attname}__{lookup}": values[i]})
+            for prev, value in zip(keyset[:i], values):
+                term &= Q(**{prev.field.attname: value})
+            condition |= term
+        return self.filter(condition)
+
+    def keyset_page(
+        self, cursor: Optional[str] = None, page_size: int = 100
+    ) -> KeysetPage:
+        """Return a page of objects and the cursor of the next page.
+
+        Parameters
+        ----------
+        cursor : str, optional
+            ``next_cursor`` of the previous page. The default is the first page.
+        page_size : int, optional
+            maximum number of objects on the page. The default is 100.
+
+        Returns
+        -------
+        page : KeysetPage
+            the objects of the page and the cursor of the next page, which is None
+            on the last page
+        """
+        keyset = keyset_fields(self.model)
+        qs = self.keyset_order()
+        if cursor is not None:
+            qs = qs.keyset_after(decode_cursor(cursor, keyset))
+        items = list(qs[: page_size + 1])
+        next_cursor = None
+        if len(items) > page_size:
+            items = items[:page_size]
+            last = items[-1]
+            next_cursor = encode_cursor(
+                [getattr(last, k.field.attname) for k in keyset]
+            )
+        return KeysetPage(items, next_cursor)
+
+    def keyset_chunks(self, chunk_size: int = 1000) -> Iterator[list]:
+        """ Iterate over all objects in lists of at most ``chunk_size`` """
+        cursor = None
+        while True:
+            page = self.keyset_page(cursor, chunk_size)
+            if page.items:
+                yield page.items
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    def keyset_iterator(self, chunk_size: int = 1000) -> Iterator[Any]:
+        """ Iterate over all objects, fetching ``chunk_size`` objects per query """
+        for chunk in self.keyset_chunks(chunk_size):
+            yield from chunk
@@ -0,0 +1,146 @@
+from collections import defaultdict
+from typing import Iterable, NamedTuple, Tuple
+
+from django.db import models as dm
+from django.db.models.fields.related_descriptors import ManyToManyDescriptor
+from django.db.models.query import ModelIterable
+
+from sa2django.exceptions import SA2DjangoException
+
+
+class M2MPath(NamedTuple):
+    through: type
+    source_field: str
+    target_field: str
+
+
+def m2m_path(django_model: type, name: str) -> M2MPath:
+    """Resolve a many-to-many relationship to its through model and foreign keys.
+
+    The through model and its foreign keys are taken from the many-to-many field
+    that sa2django generated from the ``secondary`` join condition of the
+    sqlalchemy relationship. This works for both sides of the relationship and for
+    self-referential relationships.
+
+    Parameters
+    ----------
+    django_model : type
+        django model generated by sa2django
+    name : str
+        name of the many-to-many relationship
+    """
+    # use the descriptor rather than _meta.get_field(), because reverse relations
+    # are only known to _meta for models of installed apps
+    descriptor = getattr(django_model, name, None)
+    if not isinstance(descriptor, ManyToManyDescriptor):
+        raise SA2DjangoException(
+            f"{django_model.__name__}.{name} is not a many to many relationship"
+        )
+    field = descriptor.field
+    if descriptor.reverse:
+        # reverse side of a many-to-many field declared on the other model
+        return M2MPath(
+            field.remote_field.through,
+            field.m2m_reverse_field_name(),
+            field.m2m_field_name(),
+        )
+    return M2MPath(
+        field.remote_field.through,
+        field.m2m_field_name(),
+        field.m2m_reverse_field_name(),
+    )
+
+
+def _through_ordering(path: M2MPath) -> Tuple[str, ...]:
+    target_model = path.through._meta.get_field(path.target_field).related_model
+    ordering = []
+    for field in target_model._meta.ordering:
+        if not isinstance(field, str):
+            continue
+        descending = field.startswith("-")
+        field = f"{path.target_field}__{field.lstrip('-')}"
+        ordering.append(f"-{field}" if descending else field)
+    ordering.append("pk")
+    return tuple(ordering)
+
+
+def prefetch_m2m(instances: Iterable[dm.Model], *names: str) -> None:
+    """Fill the prefetch cache of many-to-many relationships with one query each.
+
+    The through rows and the related objects are fetched together in a single
+    query on the through model that joins the related table. Afterwards
+    ``instance.<name>.all()`` does not hit the database.
+
+    Parameters
+    ----------
+    instances : iterable of django models
+        instances of the same model generated by sa2django
+    *names : str
+        names of the many-to-many relationships to prefetch
+    """
+    instances = list(instances)
+    if not instances:
+        return
+    django_model = type(instances[0])
+    for name in names:
+        path = m2m_path(django_model, name)
+        source = path.through._meta.get_field(path.source_field)
+        source_key = source.target_field.attname
+        keys = {getattr(obj, source_key) for obj in instances}
+
+        rows = (
+            path.through._default_manager.filter(**{f"{source.attname}__in": keys})
+            .select_related(path.target_field)
+            .order_by(*_through_ordering(path))
+        )
+        related = defaultdict(list)
+        for row in rows:
+            related[getattr(row, source.attname)].append(
+                getattr(row, path.target_field)
+            )
+
+        for obj in instances:
+            manager = getattr(obj, name)
+            qs = manager.get_queryset()
+            qs._result_cache = related.get(getattr(obj, source_key), [])
+            qs._prefetch_done = True
+            if not hasattr(obj, "_prefetched_objects_cache"):
+                obj._prefetched_objects_cache = {}
+            obj._prefetched_objects_cache[manager.prefetch_cache_name] = qs
+
+
+class M2MPrefetchQuerySet(dm.QuerySet):
+    """ QuerySet that supports ``prefetch_m2m()`` like ``prefetch_related()`` """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prefetch_m2m_names: Tuple[str, ...] = ()
+        self._prefetch_m2m_done = False
+
+    def prefetch_m2m(self, *names: str) -> "M2MPrefetchQuerySet":
+        """Prefetch many-to-many relationships with ``prefetch_m2m()`` when the
+        queryset is evaluated.
+
+        Passing ``None`` clears the list of relationships to prefetch.
+        """
+        clone = self._chain()
+        if names == (None,):
+            clone._prefetch_m2m_names = ()
+        else:
+            clone._prefetch_m2m_names = clone._prefetch_m2m_names + names
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._prefetch_m2m_names = self._prefetch_m2m_names
+        return clone
+
+    def _fetch_all(self):
+        super()._fetch_all()
+        if (
+            self._prefetch_m2m_names
+            and not self._prefetch_m2m_done
+            and issubclass(self._iterable_class, ModelIterable)
+        ):
+            prefetch_m2m(self._result_cache, *self._prefetch_m2m_names)
+            self._prefetch_m2m_done = True
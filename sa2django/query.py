@@ -0,0 +1,11 @@
+from django.db import models as dm
+
+from sa2django.pagination import KeysetQuerySet
+from sa2django.prefetch import M2MPrefetchQuerySet
+
+
+class SA2DQuerySet(KeysetQuerySet, M2MPrefetchQuerySet):
+    """ Default queryset of models generated by sa2django """
+
+
+SA2DManager = dm.Manager.from_queryset(SA2DQuerySet)
@@ -0,0 +1,73 @@
+import logging
+from typing import Dict, List, Optional, Set
+
+from django.apps import apps
+
+from sa2django.exceptions import SA2DjangoException
+
+logger = logging.getLogger(__name__)
+
+
+class SA2DRegistry:
+    """Bookkeeping of the django models generated from one sqlalchemy base.
+
+    Each registry has its own mapping from table names to django model names, so
+    tables of different bases do not collide, and can be unloaded when the models
+    are not needed anymore.
+
+    Parameters
+    ----------
+    app_label : str, optional
+        app label of the generated models. The default is the label of the app
+        that contains the module of the models. Use different app labels for bases
+        with models of the same name.
+    """
+
+    def __init__(self, app_label: Optional[str] = None):
+        self.app_label = app_label
+        self.table_mapping: Dict[str, str] = {}
+        self.related_fields: Set[str] = set()
+        self.models: List[type] = []
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(app_label={self.app_label!r})"
+
+    def register_table(self, tablename: str, dm_model_name: str):
+        self.table_mapping[tablename] = dm_model_name
+
+    def add_model(self, django_model: type):
+        self.models.append(django_model)
+
+    def unload(self):
+        """Forget all models of this registry.
+
+        The models are removed from this registry and from django's app registry,
+        such that they can be garbage collected once no other references to them
+        exist.
+        """
+        for Model in self.models:
+            opts = Model._meta
+            app_models = apps.all_models.get(opts.app_label, {})
+            if app_models.get(opts.model_name) is Model:
+                del app_models[opts.model_name]
+            logger.debug(f"Unloaded model {opts.label}")
+        self.models.clear()
+        self.table_mapping.clear()
+        self.related_fields.clear()
+        # app configs share their models dict with all_models, so this also
+        # expires the caches of all app configs and remaining models
+        apps.clear_cache()
+
+
+def get_sa_model(django_model: type) -> type:
+    """Return the sqlalchemy model class a django model was generated from."""
+    try:
+        return django_model._sa_model
+    except AttributeError:
+        raise SA2DjangoException(
+            f"{django_model.__name__} has not been generated from a sqlalchemy model"
+        )
+
+
+default_registry = SA2DRegistry()
+""" Registry used when no registry is specified explicitly. """
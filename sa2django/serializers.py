@@ -0,0 +1,142 @@
+import json
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.db.models import QuerySet
+
+from sa2django.column_mappers import get_type_mapper
+from sa2django.core import SA2DjangoException, get_sa_model
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 2000
+""" Number of rows fetched from the cursor and emitted as one chunk of bytes. """
+
+
+def _dumps_stdlib(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+dumps: Callable[[Any], bytes] = orjson.dumps if orjson is not None else _dumps_stdlib
+
+
+class ModelEncoder:
+    """Converts rows of a sa2django model into JSON compatible dictionaries.
+
+    The conversion functions are resolved once per model from the sqlalchemy column
+    types, such that encoding a row does not require instantiating the model.
+
+    Parameters
+    ----------
+    django_model : type
+        django model generated by sa2django
+    fields : sequence of str, optional
+        names of the fields to encode. Only concrete fields are supported, i.e., no
+        many-to-many or reverse relations. The default is all concrete fields.
+    """
+
+    def __init__(self, django_model: type, fields: Optional[Sequence[str]] = None):
+        opts = django_model._meta
+        if fields is None:
+            dj_fields = opts.concrete_fields
+        else:
+            concrete_fields = {f.name: f for f in opts.concrete_fields}
+            concrete_fields.update({f.attname: f for f in opts.concrete_fields})
+            dj_fields = []
+            for name in fields:
+                if name not in concrete_fields:
+                    raise SA2DjangoException(
+                        f"{django_model.__name__}.{name} is not a concrete field"
+                    )
+                dj_fields.append(concrete_fields[name])
+        sa_table = get_sa_model(django_model).__table__
+
+        self.attnames: List[str] = []
+        self._converters: List[Tuple[int, Callable[[Any], Any]]] = []
+        for i, field in enumerate(dj_fields):
+            self.attnames.append(field.attname)
+            sa_col = sa_table.columns.get(field.column)
+            if sa_col is None:
+                logger.debug(f"No sqlalchemy column for field {field.name}")
+                continue
+            converter = get_type_mapper(sa_col).json_converter(sa_col.type)
+            if converter is not None:
+                self._converters.append((i, converter))
+
+    def encode_row(self, row: Sequence[Any]) -> Dict[str, Any]:
+        """ Convert a row as returned by ``values_list(*self.attnames)`` """
+        if self._converters:
+            row = list(row)
+            for i, convert in self._converters:
+                value = row[i]
+                if value is not None:
+                    row[i] = convert(value)
+        return dict(zip(self.attnames, row))
+
+
+def get_encoder(
+    django_model: type, fields: Optional[Sequence[str]] = None
+) -> ModelEncoder:
+    """Return the encoder of a model for the given fields.
+
+    The encoder for all fields is cached on the model class, such that it is
+    garbage collected together with the model. Encoders for a subset of the fields
+    are cheap to build and not cached.
+    """
+    if fields is not None:
+        return ModelEncoder(django_model, fields)
+    encoder = django_model.__dict__.get("_sa2d_encoder")
+    if encoder is None:
+        encoder = ModelEncoder(django_model)
+        django_model._sa2d_encoder = encoder
+    return encoder
+
+
+def stream_json(
+    queryset: QuerySet,
+    fields: Optional[Sequence[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Serialize a queryset as a JSON array of objects, chunk by chunk.
+
+    The rows are read with ``QuerySet.iterator()``, which uses a server-side cursor
+    where the database supports it, so memory usage does not grow with the size of
+    the queryset. The result can be passed to a ``StreamingHttpResponse``.
+
+    Parameters
+    ----------
+    queryset : QuerySet
+        queryset of a django model generated by sa2django
+    fields : sequence of str, optional
+        names of the fields to serialize. The default is all concrete fields.
+        Foreign keys are serialized as their raw value under their ``attname``,
+        e.g. ``parent_id``.
+    chunk_size : int, optional
+        number of rows per yielded chunk. The default is ``DEFAULT_CHUNK_SIZE``.
+
+    Yields
+    ------
+    chunk : bytes
+        UTF-8 encoded part of the JSON document
+    """
+    encoder = get_encoder(queryset.model, fields)
+    encode_row = encoder.encode_row
+    rows = queryset.values_list(*encoder.attnames).iterator(chunk_size=chunk_size)
+
+    yield b"["
+    separator = b""
+    buffer = []
+    for row in rows:
+        buffer.append(dumps(encode_row(row)))
+        if len(buffer) >= chunk_size:
+            yield separator + b",".join(buffer)
+            separator = b","
+            buffer = []
+    if buffer:
+        yield separator + b",".join(buffer)
+    yield b"]"
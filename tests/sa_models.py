@@ -1,5 +1,14 @@
 from citext import CIText
-from sqlalchemy import FLOAT, Boolean, Column, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    FLOAT,
+    Boolean,
+    Column,
+    Date,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -18,7 +27,7 @@ class CarParentAssoc(Base):
 class Car(Base):
     __tablename__ = "car"
     car_id = Column(Integer, primary_key=True)
-    horsepower = Column(Integer)
+    horsepower = Column(Integer, index=True)
     drivers = relationship("Parent", secondary="cartoparent", back_populates="cars")
 
 
@@ -45,9 +54,25 @@ class Child(Base):
     ratio2 = Column(FLOAT)
     citextfield = Column(CIText)
     boolfield = Column(Boolean, nullable=False)
+    birthday = Column(Date)
     parent_id = Column(Integer, ForeignKey("parent.id"))
     dog_id = Column(Integer)
     parent = relationship(Parent, uselist=False, back_populates="children")
     dog = relationship(
         Dog, primaryjoin="Child.dog_id == Dog.id", foreign_keys=dog_id, backref="owners"
     )
+    friends = relationship(
+        "Child",
+        secondary="friendship",
+        primaryjoin="Child.key == Friendship.child_id",
+        secondaryjoin="Child.key == Friendship.friend_id",
+    )
+
+
+class Friendship(Base):
+    __tablename__ = "friendship"
+    id = Column(Integer, primary_key=True)
+    child = relationship("Child", foreign_keys="Friendship.child_id")
+    friend = relationship("Child", foreign_keys="Friendship.friend_id")
+    child_id = Column(Integer, ForeignKey("child.key"))
+    friend_id = Column(Integer, ForeignKey("child.key"))
@@ -0,0 +1,72 @@
+import pytest
+from django.contrib.admin import AdminSite
+from django.db import connection
+
+import tests.testsite.testapp.models as dm
+from sa2django.admin import (
+    ApproximateCountPaginator,
+    make_model_admin,
+    register_sa2d_admins,
+)
+
+
+def test_make_model_admin():
+    ChildAdmin = make_model_admin(dm.Child)
+    assert set(ChildAdmin.raw_id_fields) == {"parent", "dog"}
+    assert set(ChildAdmin.list_select_related) == {"parent", "dog"}
+    assert "parent" in ChildAdmin.list_display
+    assert ChildAdmin.paginator is ApproximateCountPaginator
+    assert ChildAdmin.show_full_result_count is False
+    assert ChildAdmin(dm.Child, AdminSite()).check() == []
+
+
+def test_make_model_admin_overrides():
+    ChildAdmin = make_model_admin(dm.Child, list_display=("name",))
+    assert ChildAdmin.list_display == ("name",)
+
+
+def test_register_sa2d_admins():
+    site = AdminSite()
+    register_sa2d_admins([dm.Parent, dm.Car, dm.CarParentAssoc], site)
+    assert site.is_registered(dm.Parent)
+    assert site._registry[dm.CarParentAssoc].raw_id_fields == ("car", "parent")
+    for model_admin in site._registry.values():
+        assert model_admin.check() == []
+
+
+@pytest.fixture
+def sqlite_stats(mock_data_session):
+    """ Fake planner statistics, removed again after the test """
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+        cursor.execute("UPDATE sqlite_stat1 SET stat = '1000' WHERE tbl = 'parent'")
+        # tables with an index only have rows per index
+        cursor.execute("UPDATE sqlite_stat1 SET stat = '500 1' WHERE tbl = 'car'")
+    yield
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM sqlite_stat1")
+        # make the query planner reload the (now empty) statistics
+        cursor.execute("ANALYZE sqlite_master")
+
+
+@pytest.mark.django_db
+def test_approximate_count(sqlite_stats):
+    class Paginator(ApproximateCountPaginator):
+        approximate_threshold = 0
+
+    parents = dm.Parent.objects.order_by("pk")
+    assert Paginator(parents, 10).count == 1000
+    # filtered querysets are counted exactly
+    assert Paginator(parents.filter(name="Peter"), 10).count == 1
+    assert Paginator(dm.Car.objects.order_by("pk"), 10).count == 500
+    # small tables are counted exactly
+    assert ApproximateCountPaginator(parents, 10).count == 2
+
+
+@pytest.mark.django_db
+def test_sqlite_stats_removed(mock_data_session):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if cursor.fetchone() is not None:
+            cursor.execute("SELECT count(*) FROM sqlite_stat1")
+            assert cursor.fetchone()[0] == 0
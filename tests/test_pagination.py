@@ -0,0 +1,154 @@
+import datetime
+import itertools
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy.ext.declarative import declarative_base
+
+import tests.testsite.testapp.models as dm
+from sa2django import SA2DRegistry
+from sa2django.core import SA2DjangoException, generate_sa2d_models
+from sa2django.pagination import (
+    InvalidCursor,
+    KeysetField,
+    encode_cursor,
+    keyset_fields,
+    sa_ordering,
+)
+
+
+def test_sa_ordering():
+    Base = declarative_base()
+
+    class Song(Base):
+        __tablename__ = "song"
+        id = Column(Integer, primary_key=True)
+        title = Column(String)
+        __mapper_args__ = {"order_by": title.desc()}
+
+    class Album(Base):
+        __tablename__ = "album"
+        id = Column(Integer, primary_key=True)
+
+    class Artist(Base):
+        __tablename__ = "artist"
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        __mapper_args__ = {"order_by": func.lower(name)}
+
+    assert sa_ordering(Song) == [("title", True), ("id", True)]
+    assert sa_ordering(Album) == [("id", False)]
+    with pytest.raises(SA2DjangoException):
+        sa_ordering(Artist)
+
+
+def test_keyset_fields():
+    assert keyset_fields(dm.Child) == [KeysetField(dm.Child._meta.pk, False)]
+
+
+@pytest.mark.django_db
+def test_keyset_page(mock_data_session):
+    page = dm.Parent.objects.keyset_page(page_size=1)
+    assert [p.name for p in page.items] == ["Peter"]
+    page = dm.Parent.objects.keyset_page(page.next_cursor, page_size=1)
+    assert [p.name for p in page.items] == ["Hugo"]
+    assert page.next_cursor is None
+
+    page = dm.Parent.objects.filter(name="Hugo").keyset_page(page_size=1)
+    assert [p.name for p in page.items] == ["Hugo"]
+    assert page.next_cursor is None
+
+
+@pytest.mark.django_db
+def test_keyset_invalid_cursor(mock_data_session):
+    with pytest.raises(InvalidCursor):
+        dm.Parent.objects.keyset_page("not a cursor")
+    with pytest.raises(InvalidCursor):
+        dm.Parent.objects.keyset_page(encode_cursor([1, 2]))
+    with pytest.raises(InvalidCursor):
+        dm.Parent.objects.keyset_page(encode_cursor(["abc"]))
+    with pytest.raises(InvalidCursor):
+        dm.Parent.objects.keyset_page(encode_cursor([[1]]))
+    with pytest.raises(InvalidCursor):
+        dm.Parent.objects.keyset_page(encode_cursor([None]))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "descending, expected",
+    [((False, False), ["Franz", "Hans"]), ((True, False), ["Hans", "Franz"])],
+)
+def test_keyset_multiple_columns(mock_data_session, monkeypatch, descending, expected):
+    opts = dm.Child._meta
+    keyset = [
+        KeysetField(opts.get_field("name"), descending[0]),
+        KeysetField(opts.pk, descending[1]),
+    ]
+    monkeypatch.setattr(dm.Child, "_sa2d_keyset", keyset, raising=False)
+    assert [c.name for c in dm.Child.objects.keyset_iterator(chunk_size=1)] == expected
+
+
+@pytest.mark.django_db
+def test_keyset_chunks(mock_data_session):
+    chunks = list(dm.Car.objects.keyset_chunks(chunk_size=1))
+    assert [len(chunk) for chunk in chunks] == [1, 1]
+    assert chunks[0][0].pk < chunks[1][0].pk
+    assert list(dm.Car.objects.none().keyset_chunks()) == []
+
+
+def make_event_base(descending: bool, nullable: bool = False):
+    Base = declarative_base()
+
+    class Event(Base):
+        __tablename__ = "event"
+        id = Column(Integer, primary_key=True)
+        ts = Column(DateTime, nullable=nullable)
+        __mapper_args__ = {"order_by": ts.desc() if descending else ts}
+
+    # the declarative class registry only holds weak references to the classes
+    return Base, Event
+
+
+@pytest.fixture
+def event_models(engine, request):
+    """ Generate models of an event table whose rows are microseconds apart """
+    Base, sa_event = make_event_base(request.param)
+    Base.metadata.create_all(engine)
+    table = Base.metadata.tables["event"]
+    start = datetime.datetime(2020, 1, 1, 12, 0, 0, 1)
+    with engine.begin() as conn:
+        conn.execute(table.delete())
+        conn.execute(
+            table.insert(),
+            [
+                {"id": i, "ts": start + datetime.timedelta(microseconds=i)}
+                for i in range(1, 6)
+            ],
+        )
+    registry = SA2DRegistry(app_label="events")
+    (Event,) = generate_sa2d_models(Base, __name__, registry)
+    yield Event
+    registry.unload()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "event_models, expected",
+    [(False, [[1, 2], [3, 4], [5]]), (True, [[5, 4], [3, 2], [1]])],
+    indirect=["event_models"],
+)
+def test_keyset_datetime_microseconds(event_models, expected):
+    # limit the number of chunks, lost precision used to repeat the first page
+    chunks = itertools.islice(event_models.objects.keyset_chunks(chunk_size=2), 5)
+    assert [[e.id for e in chunk] for chunk in chunks] == expected
+
+
+def test_keyset_nullable_column():
+    registry = SA2DRegistry(app_label="events")
+    Base, sa_event = make_event_base(False, nullable=True)
+    (Event,) = generate_sa2d_models(Base, __name__, registry)
+    try:
+        with pytest.raises(SA2DjangoException):
+            keyset_fields(Event)
+    finally:
+        registry.unload()
@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+import tests.testsite.testapp.models as dm
+from sa2django.core import SA2DjangoException
+from sa2django.prefetch import m2m_path, prefetch_m2m
+
+
+def test_m2m_path():
+    assert m2m_path(dm.Parent, "cars") == (dm.CarParentAssoc, "parent", "car")
+    assert m2m_path(dm.Car, "drivers") == (dm.CarParentAssoc, "car", "parent")
+    assert m2m_path(dm.Child, "friends") == (dm.Friendship, "child", "friend")
+    with pytest.raises(SA2DjangoException):
+        m2m_path(dm.Child, "parent")
+    with pytest.raises(SA2DjangoException):
+        m2m_path(dm.Child, "enemies")
+
+
+@pytest.mark.django_db
+def test_prefetch_m2m(mock_data_session):
+    with CaptureQueriesContext(connection) as queries:
+        parents = list(dm.Parent.objects.order_by("pk").prefetch_m2m("cars"))
+        peter, hugo = parents
+        assert sorted(c.horsepower for c in peter.cars.all()) == [32, 560]
+        assert list(hugo.cars.all()) == []
+    assert len(queries) == 2
+    assert "cartoparent" in queries[1]["sql"] and "car" in queries[1]["sql"]
+
+
+@pytest.mark.django_db
+def test_prefetch_m2m_reverse(mock_data_session):
+    cars = list(dm.Car.objects.all())
+    prefetch_m2m(cars, "drivers")
+    with CaptureQueriesContext(connection) as queries:
+        assert [[p.name for p in car.drivers.all()] for car in cars] == [
+            ["Peter"],
+            ["Peter"],
+        ]
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_prefetch_m2m_self(mock_data_session):
+    children = dm.Child.objects.order_by("name").prefetch_m2m("friends")
+    with CaptureQueriesContext(connection) as queries:
+        franz, hans = children
+        assert list(hans.friends.all()) == [franz]
+        assert list(franz.friends.all()) == []
+    assert len(queries) == 2
+
+
+@pytest.mark.django_db
+def test_prefetch_m2m_keyset_page(mock_data_session):
+    page = dm.Parent.objects.prefetch_m2m("cars").keyset_page(page_size=1)
+    with CaptureQueriesContext(connection) as queries:
+        assert len(page.items[0].cars.all()) == 2
+    assert len(queries) == 0
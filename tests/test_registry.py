@@ -0,0 +1,106 @@
+import gc
+import weakref
+
+import pytest
+from django.apps import apps
+from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+from sa2django import SA2DRegistry
+from sa2django.core import SA2DBase, generate_sa2d_models
+from sa2django.prefetch import prefetch_m2m
+from sa2django.registry import default_registry
+from sa2django.serializers import get_encoder, stream_json
+
+
+def make_base():
+    """ A schema whose table names collide with the ones in sa_models """
+    Base = declarative_base()
+
+    class Owner(Base):
+        __tablename__ = "parent"
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        pets = relationship("Pet", back_populates="owner")
+
+    class Pet(Base):
+        __tablename__ = "child"
+        key = Column(Integer, primary_key=True)
+        name = Column(String)
+        parent_id = Column(Integer, ForeignKey("parent.id"))
+        owner = relationship(Owner, back_populates="pets")
+
+    class Ownership(Base):
+        __tablename__ = "cartoparent"
+        id = Column(Integer, primary_key=True)
+        vehicle = relationship("Vehicle")
+        owner = relationship(Owner)
+        id_car = Column(Integer, ForeignKey("car.car_id"))
+        parent_id = Column(Integer, ForeignKey("parent.id"))
+
+    class Vehicle(Base):
+        __tablename__ = "car"
+        car_id = Column(Integer, primary_key=True)
+        horsepower = Column(Integer)
+        owners = relationship(Owner, secondary="cartoparent", back_populates="vehicles")
+
+    Owner.vehicles = relationship(
+        Vehicle, secondary="cartoparent", back_populates="owners"
+    )
+
+    return Base
+
+
+def test_default_registry():
+    assert SA2DBase.table_mapping is default_registry.table_mapping
+    assert default_registry.table_mapping["parent"] == "Parent"
+
+
+@pytest.mark.django_db
+def test_scoped_registry(mock_data_session):
+    registry = SA2DRegistry(app_label="plugin")
+    models = generate_sa2d_models(make_base(), __name__, registry)
+    try:
+        assert registry.table_mapping == {
+            "parent": "Owner",
+            "child": "Pet",
+            "cartoparent": "Ownership",
+            "car": "Vehicle",
+        }
+        assert default_registry.table_mapping["parent"] == "Parent"
+        assert set(registry.models) == set(models)
+
+        Owner = apps.get_registered_model("plugin", "Owner")
+        peter = Owner.objects.get(name="Peter")
+        assert sorted(p.name for p in peter.pets.all()) == ["Franz", "Hans"]
+    finally:
+        registry.unload()
+
+
+@pytest.mark.django_db
+def test_unload(mock_data_session):
+    refs = []
+    for _ in range(3):
+        registry = SA2DRegistry(app_label="plugin")
+        models = generate_sa2d_models(make_base(), __name__, registry)
+        refs.extend(weakref.ref(Model) for Model in models)
+
+        # use the models such that all caches are filled
+        Owner = apps.get_registered_model("plugin", "Owner")
+        get_encoder(Owner)
+        b"".join(stream_json(Owner.objects.all()))
+        page = Owner.objects.prefetch_m2m("vehicles").keyset_page(page_size=1)
+        assert len(page.items[0].vehicles.all()) == 2
+        Vehicle = apps.get_registered_model("plugin", "Vehicle")
+        prefetch_m2m(list(Vehicle.objects.all()), "owners")
+        del models, Owner, Vehicle, page
+
+        registry.unload()
+        assert registry.models == []
+        assert registry.table_mapping == {}
+        with pytest.raises(LookupError):
+            apps.get_registered_model("plugin", "Owner")
+
+    gc.collect()
+    assert all(ref() is None for ref in refs)
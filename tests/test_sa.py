@@ -1,49 +1,7 @@
-import sqlite3
-
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 import tests.testsite.testapp.models as dm
-from tests.sa_models import Base, Car, Child, Dog, Parent
-
-
-@pytest.fixture(scope="session")
-def engine():
-    print("NEW ENGINE")
-    engine = create_engine(
-        "sqlite://",
-        creator=lambda: sqlite3.connect(
-            "file:memorydb?mode=memory&cache=shared", uri=True
-        ),
-    )
-    yield engine
-    engine.dispose()
-
-
-@pytest.fixture(scope="session")
-def session(engine):
-    print("CREATE TABLES")
-    Base.metadata.create_all(engine)
-    session = sessionmaker(bind=engine)()
-    yield session
-    session.close()
-
-
-@pytest.fixture(scope="session")
-def mock_data_session(session):
-    parent = Parent(name="Peter")
-    parent2 = Parent(name="Hugo")
-    child1 = Child(name="Hans", age=3, parent=parent, boolfield=True)
-    child2 = Child(name="Franz", age=5, parent=parent, boolfield=False)
-    dog1 = Dog(name="Rex")
-    dog1.owners = [child2]
-    car1 = Car(horsepower=560)
-    car2 = Car(horsepower=32)
-    parent.cars = [car1, car2]
-    session.add_all([parent, parent2, child1, child2, dog1])
-    session.commit()
-    return session
+from tests.sa_models import Child, Parent
 
 
 def test_data(mock_data_session):
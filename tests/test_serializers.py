@@ -0,0 +1,63 @@
+import datetime
+import json
+
+import pytest
+from sqlalchemy import LargeBinary
+
+import tests.testsite.testapp.models as dm
+from sa2django.column_mappers import BinaryMapper, DateTimeMapper
+from sa2django.core import SA2DjangoException
+from sa2django.serializers import get_encoder, stream_json
+
+
+def test_json_converters():
+    to_json = BinaryMapper.json_converter(LargeBinary())
+    assert to_json(b"\x00\xff") == "AP8="
+    assert to_json(memoryview(b"\x00\xff")) == "AP8="
+
+    to_json = DateTimeMapper.json_converter(None)
+    assert to_json(datetime.datetime(2020, 1, 2, 3, 4, 5)) == "2020-01-02T03:04:05"
+
+
+def test_encoder_is_cached():
+    assert get_encoder(dm.Child) is get_encoder(dm.Child)
+    assert get_encoder(dm.Child, ["name"]).attnames == ["name"]
+
+
+@pytest.mark.django_db
+def test_stream_json(mock_data_session):
+    chunks = list(stream_json(dm.Child.objects.order_by("name"), chunk_size=1))
+    assert len(chunks) == 4
+    children = json.loads(b"".join(chunks))
+    assert [c["name"] for c in children] == ["Franz", "Hans"]
+    franz, hans = children
+    assert hans["birthday"] == "2017-04-01"
+    assert franz["birthday"] is None
+    assert hans["parent_id"] == dm.Parent.objects.get(name="Peter").pk
+    assert hans["boolfield"] is True
+    assert franz["citextfield"] is None
+
+
+@pytest.mark.django_db
+def test_stream_json_fields(mock_data_session):
+    qs = dm.Parent.objects.order_by("pk")
+    parents = json.loads(b"".join(stream_json(qs, fields=["name"])))
+    assert parents == [{"name": "Peter"}, {"name": "Hugo"}]
+
+
+@pytest.mark.django_db
+def test_stream_json_empty(mock_data_session):
+    qs = dm.Parent.objects.filter(name="nobody")
+    assert b"".join(stream_json(qs)) == b"[]"
+
+
+@pytest.mark.parametrize("field", ["cars", "children", "drivers", "nonexistent"])
+def test_encoder_rejects_non_concrete_fields(field):
+    model = dm.Car if field == "drivers" else dm.Parent
+    with pytest.raises(SA2DjangoException):
+        get_encoder(model, [field])
+
+
+def test_encoder_accepts_attname():
+    assert get_encoder(dm.Child, ["parent"]).attnames == ["parent_id"]
+    assert get_encoder(dm.Child, ["parent_id"]).attnames == ["parent_id"]